@@ -1,16 +1,85 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from typing import Optional
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from jwt import PyJWT, PyJWTError
 from passlib.context import CryptContext
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# New hashes are argon2id; bcrypt is only kept to verify existing hashes,
+# which authenticate_user upgrades on the next successful login
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_ph = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+_jwt = PyJWT(options={"verify_exp": True, "verify_aud": False})
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith("$argon2"):
+        try:
+            return _ph.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
+    return _ph.hash(password)
+
+def get_legacy_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    return not hashed_password.startswith("$argon2") or _ph.check_needs_rehash(hashed_password)
+
+# Password hashing is CPU-bound; run it in worker processes so it never blocks the
+# event loop. Without a started pool the loop's default executor is used.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_workers: Optional[int] = None
+
+def start_hash_pool(max_workers: Optional[int] = None):
+    global _hash_pool, _hash_pool_workers
+    _hash_pool_workers = max_workers or os.cpu_count()
+    _hash_pool = ProcessPoolExecutor(
+        max_workers=_hash_pool_workers,
+        # Don't fork the running event loop and its open sockets
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+def shutdown_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown()
+        _hash_pool = None
+
+async def _run_in_hash_pool(fn, *args):
+    loop = asyncio.get_running_loop()
+    pool = _hash_pool
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A dead worker (e.g. OOM-killed) breaks the whole pool for good;
+        # replace it once, unless a concurrent call already did, and retry
+        if _hash_pool is pool:
+            logger.warning("Password hashing pool broke, restarting it")
+            pool.shutdown(wait=False)
+            start_hash_pool(_hash_pool_workers)
+        return await loop.run_in_executor(_hash_pool, fn, *args)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(get_password_hash, password)
+
+async def legacy_hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(get_legacy_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
@@ -19,15 +88,14 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + timedelta(minutes=15)
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str):
+def decode_access_token(token: str):
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        payload = _jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        if payload.get("sub") is None:
             return None
-        return email
-    except JWTError:
+        return payload
+    except PyJWTError:
         return None
@@ -0,0 +1,110 @@
+import logging
+import time
+from typing import Optional
+from urllib.parse import urlencode
+from fastapi import Request
+from fastapi.responses import Response
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# An empty REDIS_URL disables caching and rate limiting entirely
+redis = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+    socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+) if settings.REDIS_URL else None
+
+# The cache is an optimization only: every helper degrades to a miss/no-op
+# when Redis is unavailable so requests fall back to the database. After a
+# failure Redis is skipped for REDIS_RETRY_SECONDS, so an outage costs
+# neither a timeout per call nor a warning per request.
+_retry_at = 0.0
+
+def _redis_available() -> bool:
+    return redis is not None and time.monotonic() >= _retry_at
+
+def _redis_failed(operation: str, key):
+    global _retry_at
+    _retry_at = time.monotonic() + settings.REDIS_RETRY_SECONDS
+    logger.warning(
+        "Redis %s failed for %s; bypassing cache for %ss",
+        operation, key, settings.REDIS_RETRY_SECONDS
+    )
+
+async def cache_get(key: str) -> Optional[str]:
+    if not _redis_available():
+        return None
+    try:
+        return await redis.get(key)
+    except RedisError:
+        _redis_failed("GET", key)
+        return None
+
+async def cache_set(key: str, value: str, ttl: int):
+    if not _redis_available():
+        return
+    try:
+        await redis.set(key, value, ex=ttl)
+    except RedisError:
+        _redis_failed("SET", key)
+
+async def increment_counter(key: str, ttl: int) -> Optional[int]:
+    # Returns None when Redis is unavailable so callers can fail open
+    if not _redis_available():
+        return None
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            count, _ = await pipe.execute()
+        return count
+    except RedisError:
+        _redis_failed("INCR", key)
+        return None
+
+async def cache_set_tagged(key: str, value: str, ttl: int, tag: str, tag_ttl: int):
+    # Track the key in a set so every entry for an owner can be dropped at once;
+    # tag_ttl must be at least the longest ttl used with this tag
+    if not _redis_available():
+        return
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, value, ex=ttl)
+            pipe.sadd(tag, key)
+            pipe.expire(tag, tag_ttl)
+            await pipe.execute()
+    except RedisError:
+        _redis_failed("SET", key)
+
+async def cache_delete_tag(tag: str):
+    if not _redis_available():
+        return
+    try:
+        keys = await redis.smembers(tag)
+        await redis.delete(tag, *keys)
+    except RedisError:
+        _redis_failed("tag invalidation", tag)
+
+# Response caching for per-user GET endpoints. Keys are built from the
+# caller's id and the query string only, never from dependency objects.
+RESPONSE_CACHE_PREFIX = "dash"
+
+def user_scoped_tag(namespace: str, user_id: int) -> str:
+    return f"{RESPONSE_CACHE_PREFIX}:{namespace}:{user_id}"
+
+def user_scoped_key(namespace: str, user_id: int, request: Request) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    return f"{user_scoped_tag(namespace, user_id)}:{query}"
+
+async def get_cached_response(key: str) -> Optional[Response]:
+    body = await cache_get(key)
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json")
+
+async def cache_response(key: str, tag: str, response: Response, ttl: int):
+    await cache_set_tagged(key, response.body.decode(), ttl, tag, ttl)
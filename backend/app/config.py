@@ -1,3 +1,5 @@
+from typing import List, Optional, Union
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -5,7 +7,27 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
+    # Union with str so a comma-separated env value reaches the validator as-is
+    CORS_ORIGINS: Union[List[str], str] = ["http://localhost:5173", "http://localhost:3000"]
+    SLOW_QUERY_MS: int = 200
+    DB_PING_INTERVAL_SECONDS: float = 30
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    GZIP_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_TIMEOUT_SECONDS: float = 0.5
+    REDIS_RETRY_SECONDS: float = 30
+    USER_CACHE_TTL_SECONDS: int = 300
+    PASSWORD_CACHE_TTL_SECONDS: int = 60
+    PROFILE_CACHE_TTL_SECONDS: int = 30
+    TASKS_CACHE_TTL_SECONDS: int = 10
+
+    @field_validator("CORS_ORIGINS", mode="before")
+    @classmethod
+    def split_cors_origins(cls, value):
+        if isinstance(value, str):
+            return [origin.strip() for origin in value.split(",") if origin.strip()]
+        return value
 
     class Config:
         env_file = ".env"
@@ -1,65 +1,212 @@
-from sqlalchemy.orm import Session
-from app.models import User, Task
+import hashlib
+import hmac
+import re
+import secrets
+import time
+from typing import Dict, List
+from sqlalchemy import bindparam, column, delete, insert, not_, select, table, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from app.models import User, Task, TASK_SEARCH_VECTOR
 from app.schemas import UserCreate, TaskCreate, TaskUpdate
-from app.auth import get_password_hash, verify_password
+from app.auth import (
+    hash_password_async, legacy_hash_password_async, password_needs_rehash,
+    verify_password_async
+)
+from app.cache import cache_get, cache_set
+from app.config import settings
 
 # User CRUD
-def create_user(db: Session, user: UserCreate):
+async def create_user(db: AsyncSession, user: UserCreate):
     db_user = User(
         email=user.email,
         full_name=user.full_name,
-        hashed_password=get_password_hash(user.password)
+        hashed_password=await hash_password_async(user.password)
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-def get_user_by_email(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user or not verify_password(password, user.hashed_password):
+def _password_cache_key(user_id: int, hashed_password: str, password: str) -> str:
+    # Bind the probe to the stored hash (and so its salt): changing the
+    # password invalidates cached verifications without an explicit delete
+    probe = hmac.new(
+        settings.SECRET_KEY.encode(),
+        password.encode() + hashed_password.encode(),
+        hashlib.sha256
+    ).hexdigest()
+    return f"auth:{user_id}:{probe}"
+
+# Unknown emails are verified against a dummy hash so a miss costs about as
+# much as a wrong password. While legacy bcrypt rows remain the dummy is
+# bcrypt (the slower scheme, and the one most old accounts still use);
+# once every row is argon2id it switches to argon2id. In a mixed table the
+# timing only matches accounts on the dummy's scheme.
+_dummy_password_hashes: Dict[bool, str] = {}
+_LEGACY_RECHECK_SECONDS = 300
+_legacy_hashes_remain = True
+_legacy_checked_at = float("-inf")
+
+async def _legacy_hashes_exist(db: AsyncSession) -> bool:
+    # Rehashing on login only ever removes legacy rows, so once none are
+    # left the answer is final; until then recheck every few minutes
+    global _legacy_hashes_remain, _legacy_checked_at
+    now = time.monotonic()
+    if _legacy_hashes_remain and now - _legacy_checked_at >= _LEGACY_RECHECK_SECONDS:
+        _legacy_checked_at = now
+        result = await db.execute(
+            select(User.id).where(not_(User.hashed_password.startswith("$argon2"))).limit(1)
+        )
+        _legacy_hashes_remain = result.first() is not None
+    return _legacy_hashes_remain
+
+async def _get_dummy_password_hash(db: AsyncSession) -> str:
+    legacy = await _legacy_hashes_exist(db)
+    if legacy not in _dummy_password_hashes:
+        hasher = legacy_hash_password_async if legacy else hash_password_async
+        _dummy_password_hashes[legacy] = await hasher(secrets.token_urlsafe(16))
+    return _dummy_password_hashes[legacy]
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    # Only the columns needed to verify; the full row is loaded on success
+    result = await db.execute(
+        select(User.id, User.hashed_password).where(User.email == email).limit(1)
+    )
+    credentials = result.first()
+    if credentials is None:
+        await verify_password_async(password, await _get_dummy_password_hash(db))
         return False
-    return user
+
+    cache_key = _password_cache_key(credentials.id, credentials.hashed_password, password)
+    if not await cache_get(cache_key):
+        if not await verify_password_async(password, credentials.hashed_password):
+            return False
+        await cache_set(cache_key, "1", settings.PASSWORD_CACHE_TTL_SECONDS)
+
+    if password_needs_rehash(credentials.hashed_password):
+        # Migrate legacy bcrypt (or outdated argon2 parameters) to the current hasher
+        await db.execute(
+            update(User)
+            .where(User.id == credentials.id)
+            .values(hashed_password=await hash_password_async(password))
+        )
+        await db.commit()
+
+    return await db.get(User, credentials.id)
 
 # Task CRUD
-def create_task(db: Session, task: TaskCreate, owner_id: int):
+async def create_task(db: AsyncSession, task: TaskCreate, owner_id: int):
     db_task = Task(**task.model_dump(), owner_id=owner_id)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     return db_task
 
-def get_user_tasks(db: Session, owner_id: int, skip: int = 0, limit: int = 100):
-    return db.query(Task).filter(Task.owner_id == owner_id).offset(skip).limit(limit).all()
-
-def search_tasks(db: Session, owner_id: int, search: str):
-    return db.query(Task).filter(
-        Task.owner_id == owner_id,
-        Task.title.ilike(f"%{search}%")
-    ).all()
-
-def get_task(db: Session, task_id: int, owner_id: int):
-    return db.query(Task).filter(Task.id == task_id, Task.owner_id == owner_id).first()
-
-def update_task(db: Session, task_id: int, owner_id: int, task: TaskUpdate):
-    db_task = get_task(db, task_id, owner_id)
-    if not db_task:
-        return None
-    
-    for key, value in task.model_dump(exclude_unset=True).items():
-        setattr(db_task, key, value)
-    
-    db.commit()
-    db.refresh(db_task)
+# Load owners in one IN (...) query and fail loudly on any other lazy load
+_TASK_LIST_OPTIONS = (selectinload(Task.owner), raiseload("*"))
+
+async def create_tasks(db: AsyncSession, tasks: List[TaskCreate], owner_id: int):
+    # A single INSERT ... RETURNING; SQLAlchemy batches the rows into
+    # multi-VALUES statements instead of one round-trip per task. Rows come
+    # back in input order so clients can match results to their request.
+    rows = [{**task.model_dump(), "owner_id": owner_id} for task in tasks]
+    result = await db.scalars(
+        insert(Task).returning(Task, sort_by_parameter_order=True), rows
+    )
+    db_tasks = result.all()
+    await db.commit()
+    return db_tasks
+
+async def get_user_tasks(db: AsyncSession, owner_id: int, skip: int = 0, limit: int = 100):
+    result = await db.execute(
+        select(Task)
+        .where(Task.owner_id == owner_id)
+        .options(*_TASK_LIST_OPTIONS)
+        .order_by(Task.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+_TASKS_FTS = table("tasks_fts", column("rowid"))
+
+# Search statements are built once with bound parameters, so each call only
+# supplies values and reuses the same cached compilation
+_SQLITE_SEARCH_STMT = (
+    select(Task)
+    .join(_TASKS_FTS, _TASKS_FTS.c.rowid == Task.id)
+    .where(Task.owner_id == bindparam("owner_id"), text("tasks_fts MATCH :query"))
+    .order_by(Task.id)
+    .options(*_TASK_LIST_OPTIONS)
+)
+_POSTGRES_SEARCH_STMT = (
+    select(Task)
+    .where(
+        Task.owner_id == bindparam("owner_id"),
+        text(f"{TASK_SEARCH_VECTOR} @@ to_tsquery('simple', :query)")
+    )
+    .order_by(Task.id)
+    .options(*_TASK_LIST_OPTIONS)
+)
+_ILIKE_SEARCH_STMT = (
+    select(Task)
+    .where(Task.owner_id == bindparam("owner_id"), Task.title.ilike(bindparam("query")))
+    .order_by(Task.id)
+    .options(*_TASK_LIST_OPTIONS)
+)
+
+async def search_tasks(db: AsyncSession, owner_id: int, search: str):
+    # Each search word matches as a prefix of a word in the title or description
+    terms = re.findall(r"\w+", search)
+    if not terms:
+        return []
+
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        stmt, query = _SQLITE_SEARCH_STMT, " ".join(f'"{term}"*' for term in terms)
+    elif dialect == "postgresql":
+        stmt, query = _POSTGRES_SEARCH_STMT, " & ".join(f"{term}:*" for term in terms)
+    else:
+        stmt, query = _ILIKE_SEARCH_STMT, f"%{search}%"
+
+    result = await db.execute(stmt, {"owner_id": owner_id, "query": query})
+    return result.scalars().all()
+
+async def get_task(db: AsyncSession, task_id: int, owner_id: int):
+    result = await db.execute(
+        select(Task).where(Task.id == task_id, Task.owner_id == owner_id)
+    )
+    return result.scalar_one_or_none()
+
+async def update_task(db: AsyncSession, task_id: int, owner_id: int, task: TaskUpdate):
+    values = task.model_dump(exclude_unset=True)
+    if not values:
+        return await get_task(db, task_id, owner_id)
+
+    # One UPDATE ... RETURNING round-trip instead of SELECT + UPDATE
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .values(**values)
+        .returning(Task)
+        .execution_options(synchronize_session=False)
+    )
+    db_task = result.scalar_one_or_none()
+    await db.commit()
     return db_task
 
-def delete_task(db: Session, task_id: int, owner_id: int):
-    db_task = get_task(db, task_id, owner_id)
-    if db_task:
-        db.delete(db_task)
-        db.commit()
-        return True
-    return False
+async def delete_task(db: AsyncSession, task_id: int, owner_id: int):
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.owner_id == owner_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.scalar_one_or_none() is not None
+    await db.commit()
+    return deleted
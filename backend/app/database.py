@@ -1,18 +1,110 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from app.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+logger = logging.getLogger(__name__)
+
+def get_async_database_url(url: str) -> str:
+    # Map the plain driver URLs used in .env onto their asyncio drivers
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+
+engine = create_async_engine(
+    DATABASE_URL,
+    # Liveness is checked by ping_loop in the background instead of a
+    # SELECT 1 on every checkout
+    pool_pre_ping=False,
+    # SQLite uses a non-queue pool, so the sizing options only apply elsewhere.
+    # A hard cap with a short timeout fails fast instead of queueing forever.
+    **({} if "sqlite" in DATABASE_URL else {
+        "pool_size": 20,
+        "max_overflow": 0,
+        "pool_timeout": 5,
+        # Below typical server/proxy idle timeouts
+        "pool_recycle": 1800,
+    })
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    if elapsed_ms >= settings.SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, statement)
+
+# Statements executed in the current context, collected by every active
+# count_queries() block (the request middleware and any test wrapping it)
+_query_logs: ContextVar[Tuple[List[str], ...]] = ContextVar("query_logs", default=())
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    for queries in _query_logs.get():
+        queries.append(statement)
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement run inside the block, e.g. to assert N+1 fixes hold."""
+    queries: List[str] = []
+    token = _query_logs.set(_query_logs.get() + (queries,))
     try:
-        yield db
+        yield queries
     finally:
-        db.close()
+        _query_logs.reset(token)
+
+async def ping_loop(engine, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except PoolTimeoutError:
+            # Every connection is checked out, i.e. in use and alive. Disposing
+            # now would let those connections bypass the new pool's size cap.
+            continue
+        except (DBAPIError, OSError):
+            # Drop every pooled connection so requests reconnect cleanly
+            logger.warning("Database ping failed, disposing connection pool")
+            await engine.dispose()
+        except SQLAlchemyError:
+            logger.exception("Database ping failed")
+
+# The session opened for the current request, shared by every dependency
+_request_session: ContextVar[Optional[AsyncSession]] = ContextVar("request_session", default=None)
+
+@asynccontextmanager
+async def request_session():
+    async with AsyncSessionLocal() as db:
+        token = _request_session.set(db)
+        try:
+            yield db
+        finally:
+            _request_session.reset(token)
+
+async def get_db():
+    db = _request_session.get()
+    if db is not None:
+        yield db
+        return
+
+    # Outside a request (scripts, tests without the middleware)
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,30 +1,136 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
 from app.database import get_db
-from app.auth import decode_token
-from app.models import User
-from sqlalchemy.orm import Session
+from app.auth import decode_access_token
+from app.cache import (
+    cache_get, cache_set_tagged, cache_delete_tag, increment_counter, user_scoped_tag
+)
+from app.config import settings
+from app.crud import get_user_by_email
+from sqlalchemy.ext.asyncio import AsyncSession
 
-security = HTTPBearer()
+def extract_bearer(request: Request) -> str:
+    # Plain header slicing; avoids HTTPBearer's credentials model per request
+    auth = request.headers.get("authorization")
+    token = auth[7:].strip() if auth and auth[:7].lower() == "bearer " else None
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return token
+
+class BearerScheme(HTTPBearer):
+    """Declares bearer auth in OpenAPI (the /docs Authorize button) while
+    resolving to the raw token through extract_bearer."""
+
+    async def __call__(self, request: Request) -> str:
+        return extract_bearer(request)
+
+bearer_scheme = BearerScheme(scheme_name="bearerAuth")
+
+@dataclass
+class CachedUser:
+    """Detached snapshot of a User, rebuilt from Redis without touching the DB."""
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    created_at: datetime
+
+def _user_cache_key(token: str) -> str:
+    return "user:" + hashlib.blake2b(token.encode()).hexdigest()
+
+# Response cache namespace of GET /api/users/me
+PROFILE_CACHE_NAMESPACE = "profile"
+
+def _user_tokens_key(user_id: int) -> str:
+    return f"user_tokens:{user_id}"
+
+async def invalidate_cached_user(user_id: int):
+    """Drop every cached token->user entry and the cached profile response;
+    call after updating or deleting a user."""
+    await cache_delete_tag(_user_tokens_key(user_id))
+    await cache_delete_tag(user_scoped_tag(PROFILE_CACHE_NAMESPACE, user_id))
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    request: Request,
+    token: str = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_db)
 ):
-    token = credentials.credentials
-    email = decode_token(token)
-    
-    if not email:
+    # Resolve the token at most once per request, however often this runs
+    if hasattr(request.state, "user"):
+        return request.state.user
+
+    payload = decode_access_token(token)
+
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
-    
-    user = db.query(User).filter(User.email == email).first()
+
+    request.state.jwt_claims = payload
+    cache_key = _user_cache_key(token)
+    cached = await cache_get(cache_key)
+    if cached:
+        data = json.loads(cached)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        request.state.user = CachedUser(**data)
+        return request.state.user
+
+    user = await get_user_by_email(db, payload["sub"])
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-    
+
+    ttl = min(int(payload["exp"] - time.time()), settings.USER_CACHE_TTL_SECONDS)
+    if ttl > 0:
+        await cache_set_tagged(
+            cache_key,
+            json.dumps({
+                "id": user.id,
+                "email": user.email,
+                "full_name": user.full_name,
+                "is_active": user.is_active,
+                "created_at": user.created_at.isoformat(),
+            }),
+            ttl,
+            _user_tokens_key(user.id),
+            settings.USER_CACHE_TTL_SECONDS,
+        )
+
+    request.state.user = user
     return user
+
+async def get_cached_claims(request: Request, current_user = Depends(get_current_user)):
+    """JWT claims verified by get_current_user, without decoding the token again."""
+    return request.state.jwt_claims
+
+class RateLimiter:
+    """Fixed-window limit of `times` requests per `seconds` for each client IP."""
+
+    def __init__(self, scope: str, times: int, seconds: int):
+        self.scope = scope
+        self.times = times
+        self.seconds = seconds
+
+    async def __call__(self, request: Request):
+        client = request.client.host if request.client else "unknown"
+        now = int(time.time())
+        window = now // self.seconds
+        count = await increment_counter(f"rl:{self.scope}:{client}:{window}", self.seconds)
+        if count is not None and count > self.times:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": str(self.seconds - now % self.seconds)}
+            )
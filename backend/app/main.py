@@ -1,23 +1,74 @@
-from fastapi import FastAPI
+import asyncio
+import hmac
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import Base, engine
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.database import Base, count_queries, engine, ping_loop, request_session
+from app.auth import shutdown_hash_pool, start_hash_pool
+from app.cache import redis
+from app.dependencies import extract_bearer
+from app.metrics import DB_QUERIES_PER_REQUEST
+from app.models import create_search_index
 from app.routes import auth, users, tasks
 from app.config import settings
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_index)
 
-app = FastAPI(title="Auth Dashboard API", version="1.0.0")
+    start_hash_pool(settings.PASSWORD_HASH_WORKERS)
+    pinger = asyncio.create_task(ping_loop(engine, settings.DB_PING_INTERVAL_SECONDS))
+    yield
+    pinger.cancel()
+    with suppress(asyncio.CancelledError):
+        await pinger
+    shutdown_hash_pool()
+    if redis is not None:
+        await redis.aclose()
+    await engine.dispose()
+
+app = FastAPI(
+    title="Auth Dashboard API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS.split(","),
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress JSON bodies such as task lists; turn off when a reverse proxy
+# (e.g. nginx with gzip on) already compresses responses
+if settings.GZIP_ENABLED:
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
+
+# One database session per request, shared through a context variable.
+# Queries are counted per method and route so N+1 regressions show up in /metrics.
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    with count_queries() as queries:
+        async with request_session():
+            response = await call_next(request)
+
+    route = request.scope.get("route")
+    if route is not None:
+        DB_QUERIES_PER_REQUEST.labels(
+            method=request.method, route=route.path
+        ).observe(len(queries))
+    return response
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
@@ -30,3 +81,18 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "healthy"}
+
+# Prometheus scrapes with METRICS_TOKEN as a bearer token; without a token
+# configured the endpoint is not served at all
+@app.get("/metrics", include_in_schema=False)
+def metrics(request: Request):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    token = extract_bearer(request)
+    if not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
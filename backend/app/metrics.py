@@ -0,0 +1,8 @@
+from prometheus_client import Histogram
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while handling a request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50),
+)
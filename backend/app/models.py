@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 
+# Full-text document for a task; search queries must use this exact
+# expression for PostgreSQL to pick the GIN index
+TASK_SEARCH_VECTOR = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
 class User(Base):
     __tablename__ = "users"
     
@@ -19,7 +23,7 @@ class Task(Base):
     __tablename__ = "tasks"
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    title = Column(String)
     description = Column(Text, nullable=True)
     status = Column(String, default="pending")  # pending, completed
     owner_id = Column(Integer, ForeignKey("users.id"))
@@ -27,3 +31,43 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     owner = relationship("User", back_populates="tasks")
+
+    # Every task query is scoped by owner_id, so lead the indexes with it
+    __table_args__ = (
+        Index("ix_tasks_owner_id_id", "owner_id", "id"),
+        Index(
+            "ix_tasks_search_vector",
+            text(TASK_SEARCH_VECTOR),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+# SQLite keeps an FTS5 index over title/description in sync with triggers
+_SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+def create_search_index(connection):
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tasks_fts'"
+    ).first()
+    for statement in _SQLITE_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        # Index tasks that predate the FTS table
+        connection.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
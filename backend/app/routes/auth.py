@@ -1,27 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import UserCreate, LoginRequest, Token, UserResponse
 from app.crud import create_user, authenticate_user, get_user_by_email
 from app.auth import create_access_token
 from app.config import settings
+from app.dependencies import RateLimiter
 
 router = APIRouter()
 
-@router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    if get_user_by_email(db, user.email):
+# Both endpoints run the password hasher (argon2id, or bcrypt for legacy
+# accounts), so cap how often a single client can hit them
+register_rate_limit = RateLimiter("register", times=3, seconds=3600)
+login_rate_limit = RateLimiter("login", times=5, seconds=60)
+
+@router.post("/register", response_model=UserResponse, dependencies=[Depends(register_rate_limit)])
+async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    if await get_user_by_email(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    return create_user(db, user)
+    return await create_user(db, user)
 
-@router.post("/login", response_model=Token)
-def login(credentials: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db, credentials.email, credentials.password)
+@router.post("/login", response_model=Token, dependencies=[Depends(login_rate_limit)])
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, credentials.email, credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
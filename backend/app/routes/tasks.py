@@ -1,63 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
+from app.cache import (
+    cache_delete_tag, cache_response, get_cached_response,
+    user_scoped_key, user_scoped_tag
+)
+from app.config import settings
 from app.database import get_db
-from app.schemas import TaskResponse, TaskCreate, TaskUpdate
+from app.schemas import TaskResponse, TaskCreate, TaskUpdate, TaskListAdapter
 from app.crud import (
-    create_task, get_user_tasks, search_tasks,
+    create_task, create_tasks, get_user_tasks, search_tasks,
     get_task, update_task, delete_task
 )
 from app.dependencies import get_current_user
 
 router = APIRouter()
 
+CACHE_NAMESPACE = "tasks"
+
+# Keeps one bulk request to a bounded INSERT and response; larger imports
+# are split client-side
+MAX_BULK_TASKS = 100
+
+async def invalidate_task_list(user_id: int):
+    await cache_delete_tag(user_scoped_tag(CACHE_NAMESPACE, user_id))
+
 @router.post("/", response_model=TaskResponse)
-def create_new_task(
+async def create_new_task(
     task: TaskCreate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    return create_task(db, task, current_user.id)
+    db_task = await create_task(db, task, current_user.id)
+    await invalidate_task_list(current_user.id)
+    return db_task
+
+@router.post("/bulk", response_model=List[TaskResponse])
+async def create_bulk_tasks(
+    tasks: List[TaskCreate] = Body(..., max_length=MAX_BULK_TASKS),
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    if not tasks:
+        return []
+    db_tasks = await create_tasks(db, tasks, current_user.id)
+    await invalidate_task_list(current_user.id)
+    return db_tasks
 
 @router.get("/", response_model=List[TaskResponse])
-def list_tasks(
+async def list_tasks(
+    request: Request,
     search: str = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
+    cache_key = user_scoped_key(CACHE_NAMESPACE, current_user.id, request)
+    cached = await get_cached_response(cache_key)
+    if cached:
+        return cached
+
     if search:
-        return search_tasks(db, current_user.id, search)
-    return get_user_tasks(db, current_user.id)
+        tasks = await search_tasks(db, current_user.id, search)
+    else:
+        tasks = await get_user_tasks(db, current_user.id)
+
+    # Validate and serialize the whole page through one precompiled adapter
+    # straight to JSON bytes, bypassing the per-row response_model pass
+    response = Response(
+        TaskListAdapter.dump_json(TaskListAdapter.validate_python(tasks, from_attributes=True)),
+        media_type="application/json"
+    )
+    await cache_response(
+        cache_key,
+        user_scoped_tag(CACHE_NAMESPACE, current_user.id),
+        response,
+        settings.TASKS_CACHE_TTL_SECONDS
+    )
+    return response
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_single_task(
+async def get_single_task(
     task_id: int,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    task = get_task(db, task_id, current_user.id)
+    task = await get_task(db, task_id, current_user.id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_single_task(
+async def update_single_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    task = update_task(db, task_id, current_user.id, task_update)
+    task = await update_task(db, task_id, current_user.id, task_update)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    await invalidate_task_list(current_user.id)
     return task
 
 @router.delete("/{task_id}")
-def delete_single_task(
+async def delete_single_task(
     task_id: int,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    if not delete_task(db, task_id, current_user.id):
+    if not await delete_task(db, task_id, current_user.id):
         raise HTTPException(status_code=404, detail="Task not found")
+    await invalidate_task_list(current_user.id)
     return {"message": "Task deleted successfully"}
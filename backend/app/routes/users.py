@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import cache_response, get_cached_response, user_scoped_key, user_scoped_tag
+from app.config import settings
 from app.database import get_db
-from app.schemas import UserResponse
-from app.dependencies import get_current_user
+from app.schemas import UserResponse, UserResponseAdapter
+from app.dependencies import PROFILE_CACHE_NAMESPACE, get_current_user
 
 router = APIRouter()
 
+CACHE_NAMESPACE = PROFILE_CACHE_NAMESPACE
+
 @router.get("/me", response_model=UserResponse)
-def get_profile(current_user = Depends(get_current_user)):
-    return current_user
+async def get_profile(request: Request, current_user = Depends(get_current_user)):
+    cache_key = user_scoped_key(CACHE_NAMESPACE, current_user.id, request)
+    cached = await get_cached_response(cache_key)
+    if cached:
+        return cached
+
+    response = Response(
+        UserResponseAdapter.dump_json(
+            UserResponseAdapter.validate_python(current_user, from_attributes=True)
+        ),
+        media_type="application/json"
+    )
+    await cache_response(
+        cache_key,
+        user_scoped_tag(CACHE_NAMESPACE, current_user.id),
+        response,
+        settings.PROFILE_CACHE_TTL_SECONDS
+    )
+    return response
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -13,9 +13,8 @@ class UserResponse(UserBase):
     id: int
     is_active: bool
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, defer_build=False)
 
 class TaskBase(BaseModel):
     title: str
@@ -35,9 +34,8 @@ class TaskResponse(TaskBase):
     owner_id: int
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, defer_build=False)
 
 class Token(BaseModel):
     access_token: str
@@ -46,3 +44,7 @@ class Token(BaseModel):
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+
+# Built once at import; a list adapter validates/dumps a whole page in one call
+TaskListAdapter = TypeAdapter(List[TaskResponse])
+UserResponseAdapter = TypeAdapter(UserResponse)
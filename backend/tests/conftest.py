@@ -0,0 +1,38 @@
+import os
+import tempfile
+import uuid
+
+# Configure the app before it is imported: a throwaway SQLite database and no
+# Redis, so caching and rate limiting are bypassed
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["REDIS_URL"] = ""
+os.environ["PASSWORD_HASH_WORKERS"] = "1"
+os.environ["METRICS_TOKEN"] = "test-metrics-token"
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.main import app
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture(scope="session")
+async def client():
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+@pytest.fixture
+async def credentials(client):
+    """A freshly registered user, so tests never see each other's tasks."""
+    credentials = {"email": f"{uuid.uuid4().hex}@example.com", "password": "Pass123!"}
+    response = await client.post("/api/auth/register", json={**credentials, "full_name": "Tester"})
+    assert response.status_code == 200
+    return credentials
+
+@pytest.fixture
+async def auth_headers(client, credentials):
+    response = await client.post("/api/auth/login", json=credentials)
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import not_, select, update
+from app import crud
+from app.auth import get_password_hash, pwd_context
+from app.database import count_queries, engine
+from app.models import User
+
+pytestmark = pytest.mark.anyio
+
+async def test_openapi_declares_bearer_auth_on_protected_routes(client):
+    schema = (await client.get("/openapi.json")).json()
+
+    assert schema["components"]["securitySchemes"]["bearerAuth"] == {
+        "type": "http", "scheme": "bearer"
+    }
+    assert schema["paths"]["/api/tasks/"]["get"]["security"] == [{"bearerAuth": []}]
+    assert schema["paths"]["/api/users/me"]["get"]["security"] == [{"bearerAuth": []}]
+    assert "security" not in schema["paths"]["/api/auth/login"]["post"]
+
+async def test_protected_route_rejects_missing_or_malformed_token(client):
+    assert (await client.get("/api/users/me")).status_code == 401
+    response = await client.get("/api/users/me", headers={"Authorization": "Basic abc"})
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+async def set_stored_hash(email, hashed_password):
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(User).where(User.email == email).values(hashed_password=hashed_password)
+        )
+
+async def get_stored_hash(email):
+    async with engine.connect() as conn:
+        result = await conn.execute(select(User.hashed_password).where(User.email == email))
+        return result.scalar_one()
+
+@pytest.fixture
+def fresh_dummy_hash_state(monkeypatch):
+    """Forget which dummy hash scheme crud picked, as a newly started worker would."""
+    monkeypatch.setattr(crud, "_dummy_password_hashes", {})
+    monkeypatch.setattr(crud, "_legacy_hashes_remain", True)
+    monkeypatch.setattr(crud, "_legacy_checked_at", float("-inf"))
+
+async def test_legacy_bcrypt_login_upgrades_hash_to_argon2id(client, credentials):
+    await set_stored_hash(credentials["email"], pwd_context.hash(credentials["password"]))
+
+    response = await client.post("/api/auth/login", json=credentials)
+
+    assert response.status_code == 200
+    assert (await get_stored_hash(credentials["email"])).startswith("$argon2id$")
+    # The upgraded hash keeps working
+    assert (await client.post("/api/auth/login", json=credentials)).status_code == 200
+
+async def test_legacy_bcrypt_login_rejects_wrong_password(client, credentials):
+    legacy_hash = pwd_context.hash(credentials["password"])
+    await set_stored_hash(credentials["email"], legacy_hash)
+
+    response = await client.post(
+        "/api/auth/login", json={**credentials, "password": "wrong-password"}
+    )
+
+    assert response.status_code == 401
+    assert await get_stored_hash(credentials["email"]) == legacy_hash
+
+async def test_unknown_email_is_rejected(client):
+    response = await client.post(
+        "/api/auth/login", json={"email": "nobody@example.com", "password": "Pass123!"}
+    )
+    assert response.status_code == 401
+
+async def test_dummy_hash_follows_remaining_legacy_hashes(
+    client, credentials, fresh_dummy_hash_state, monkeypatch
+):
+    unknown = {"email": "nobody@example.com", "password": "Pass123!"}
+    await set_stored_hash(credentials["email"], pwd_context.hash(credentials["password"]))
+
+    assert (await client.post("/api/auth/login", json=unknown)).status_code == 401
+    assert crud._legacy_hashes_remain is True
+    assert crud._dummy_password_hashes[True].startswith("$2b$")
+
+    # Upgrade every legacy row, including ones left behind by other tests
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(User)
+            .where(not_(User.hashed_password.startswith("$argon2")))
+            .values(hashed_password=get_password_hash(credentials["password"]))
+        )
+    monkeypatch.setattr(crud, "_legacy_checked_at", float("-inf"))
+
+    assert (await client.post("/api/auth/login", json=unknown)).status_code == 401
+    assert crud._legacy_hashes_remain is False
+    assert crud._dummy_password_hashes[False].startswith("$argon2id$")
+
+    # Once no legacy rows remain the users table is not scanned again
+    with count_queries() as queries:
+        await client.post("/api/auth/login", json=unknown)
+    assert len(queries) == 1
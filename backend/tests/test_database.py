@@ -0,0 +1,45 @@
+import asyncio
+import sqlite3
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.database import ping_loop
+
+pytestmark = pytest.mark.anyio
+
+async def run_pings(engine, until=lambda: False, seconds=0.5):
+    pinger = asyncio.create_task(ping_loop(engine, 0.05))
+    deadline = asyncio.get_running_loop().time() + seconds
+    while not until() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.005)
+    pinger.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pinger
+
+async def test_ping_keeps_a_busy_pool(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/busy.db",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    pool = engine.pool
+    async with engine.connect():
+        # The only connection is checked out, so every ping times out
+        await run_pings(engine)
+
+    assert engine.pool is pool
+    await engine.dispose()
+
+async def refuse_connection():
+    raise sqlite3.OperationalError("unable to open database file")
+
+async def test_ping_disposes_pool_on_connection_failure():
+    engine = create_async_engine("sqlite+aiosqlite://", async_creator=refuse_connection)
+    pool = engine.pool
+
+    await run_pings(engine, until=lambda: engine.pool is not pool)
+
+    assert engine.pool is not pool
+    await engine.dispose()
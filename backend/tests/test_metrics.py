@@ -0,0 +1,19 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+async def test_metrics_requires_token(client):
+    response = await client.get("/metrics")
+    assert response.status_code == 401
+
+    response = await client.get("/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
+
+async def test_metrics_served_at_exact_path(client, auth_headers):
+    await client.get("/api/tasks/", headers=auth_headers)
+
+    response = await client.get(
+        "/metrics", headers={"Authorization": "Bearer test-metrics-token"}
+    )
+    assert response.status_code == 200
+    assert 'db_queries_per_request_count{method="GET",route="/api/tasks/"}' in response.text
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import insert
+from app.database import engine
+from app.models import Task, User, create_search_index
+
+pytestmark = pytest.mark.anyio
+
+async def search(client, headers, query):
+    response = await client.get("/api/tasks/", params={"search": query}, headers=headers)
+    assert response.status_code == 200
+    return [task["title"] for task in response.json()]
+
+async def test_search_matches_word_prefixes_in_title_and_description(client, auth_headers):
+    await client.post(
+        "/api/tasks/bulk",
+        json=[
+            {"title": "Weekly report", "description": "Send to finance"},
+            {"title": "Groceries", "description": "Milk and bread"},
+        ],
+        headers=auth_headers
+    )
+
+    assert await search(client, auth_headers, "rep") == ["Weekly report"]
+    assert await search(client, auth_headers, "fin") == ["Weekly report"]
+    assert await search(client, auth_headers, "weekly fin") == ["Weekly report"]
+    # Prefixes of words only, not arbitrary substrings
+    assert await search(client, auth_headers, "port") == []
+    assert await search(client, auth_headers, "weekly milk") == []
+
+async def test_search_index_follows_inserts_updates_and_deletes(client, auth_headers):
+    response = await client.post("/api/tasks/", json={"title": "Renew passport"}, headers=auth_headers)
+    task_id = response.json()["id"]
+    assert await search(client, auth_headers, "passport") == ["Renew passport"]
+
+    await client.put(f"/api/tasks/{task_id}", json={"title": "Renew licence"}, headers=auth_headers)
+    assert await search(client, auth_headers, "passport") == []
+    assert await search(client, auth_headers, "licence") == ["Renew licence"]
+
+    await client.delete(f"/api/tasks/{task_id}", headers=auth_headers)
+    assert await search(client, auth_headers, "licence") == []
+
+async def test_search_index_rebuild_covers_existing_tasks(client, credentials, auth_headers):
+    # Recreate the state of a database from before the FTS table existed
+    async with engine.begin() as conn:
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            await conn.exec_driver_sql(f"DROP TRIGGER {trigger}")
+        await conn.exec_driver_sql("DROP TABLE tasks_fts")
+        owner_id = (await conn.execute(
+            User.__table__.select().where(User.email == credentials["email"])
+        )).first().id
+        await conn.execute(insert(Task).values(title="Legacy backlog item", owner_id=owner_id))
+
+    async with engine.begin() as conn:
+        await conn.run_sync(create_search_index)
+
+    assert await search(client, auth_headers, "backlog") == ["Legacy backlog item"]
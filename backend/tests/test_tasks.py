@@ -0,0 +1,54 @@
+import pytest
+from app.database import count_queries
+
+pytestmark = pytest.mark.anyio
+
+async def create_tasks(client, headers, count):
+    response = await client.post(
+        "/api/tasks/bulk",
+        json=[{"title": f"Task {i}"} for i in range(count)],
+        headers=headers
+    )
+    assert response.status_code == 200
+
+async def count_list_queries(client, headers, expected_tasks):
+    with count_queries() as queries:
+        response = await client.get("/api/tasks/", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()) == expected_tasks
+    return len(queries)
+
+async def test_list_tasks_query_count_is_bounded(client, auth_headers):
+    await create_tasks(client, auth_headers, 5)
+    small = await count_list_queries(client, auth_headers, 5)
+
+    await create_tasks(client, auth_headers, 45)
+    large = await count_list_queries(client, auth_headers, 50)
+
+    # User lookup, the task page and one IN (...) load of owners, however
+    # many tasks there are
+    assert small == large == 3
+
+async def test_bulk_create_returns_tasks_in_request_order(client, auth_headers):
+    titles = [f"Task {i}" for i in reversed(range(100))]
+    response = await client.post(
+        "/api/tasks/bulk", json=[{"title": title} for title in titles], headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == titles
+
+async def test_bulk_create_rejects_more_than_100_tasks(client, auth_headers):
+    response = await client.post(
+        "/api/tasks/bulk", json=[{"title": "Task"}] * 101, headers=auth_headers
+    )
+
+    assert response.status_code == 422
+    assert (await client.get("/api/tasks/", headers=auth_headers)).json() == []
+
+async def test_bulk_create_accepts_empty_list(client, auth_headers):
+    response = await client.post("/api/tasks/bulk", json=[], headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == []